@@ -74,6 +74,11 @@ webhooks:
       apiGroups: [""]
       apiVersions: ["v1"]
       resources: ["pods"]
+    # Ephemeral containers (kubectl debug) are added through this subresource
+    - operations: ["UPDATE"]
+      apiGroups: [""]
+      apiVersions: ["v1"]
+      resources: ["pods/ephemeralcontainers"]
     admissionReviewVersions: ["v1", "v1beta1"]
     sideEffects: None
     failurePolicy: Fail
@@ -44,6 +44,72 @@ test_pod() {
     fi
 }
 
+# Function to test adding an ephemeral container (kubectl debug) to a running pod
+test_debug() {
+    local pod_name="$1"
+    local image="$2"
+    local expected_result="$3"
+    local description="$4"
+    
+    echo ""
+    echo "Testing: $description"
+    echo "Debug image: $image"
+    echo "Expected: $expected_result"
+    echo "----------------------------------------"
+    
+    if [ "$expected_result" == "ALLOW" ]; then
+        if kubectl debug "pod/$pod_name" --image="$image" -- sleep 5; then
+            echo "✅ PASS: Ephemeral container was allowed as expected"
+        else
+            echo "❌ FAIL: Ephemeral container should have been allowed but was denied"
+            return 1
+        fi
+    elif [ "$expected_result" == "DENY" ]; then
+        if kubectl debug "pod/$pod_name" --image="$image" -- sleep 5 2>/dev/null; then
+            echo "❌ FAIL: Ephemeral container should have been denied but was allowed"
+            return 1
+        else
+            echo "✅ PASS: Ephemeral container was denied as expected"
+        fi
+    fi
+}
+
+# Function to post an AdmissionReview fixture straight to /validate and check the decision
+# (covers operations the webhook rules don't send from kubectl, e.g. UPDATE on pods)
+test_review() {
+    local review_file="$1"
+    local expected_result="$2"
+    local description="$3"
+    local response
+    
+    echo ""
+    echo "Testing: $description"
+    echo "Review file: $(basename "$review_file")"
+    echo "Expected: $expected_result"
+    echo "----------------------------------------"
+    
+    response=$(kubectl run review-client --image=curlimages/curl:latest --rm -i --quiet --restart=Never -- \
+        curl -sk -X POST -H "Content-Type: application/json" --data-binary @- \
+        https://attestation-admission-controller.default.svc.cluster.local:443/validate < "$review_file" || true)
+    echo "Response: $response"
+    
+    if [ "$expected_result" == "ALLOW" ]; then
+        if echo "$response" | grep -q '"allowed":true'; then
+            echo "✅ PASS: Review was allowed as expected"
+        else
+            echo "❌ FAIL: Review should have been allowed but was not"
+            return 1
+        fi
+    elif [ "$expected_result" == "DENY" ]; then
+        if echo "$response" | grep -q '"allowed":false'; then
+            echo "✅ PASS: Review was denied as expected"
+        else
+            echo "❌ FAIL: Review should have been denied but was not"
+            return 1
+        fi
+    fi
+}
+
 # Check if webhook is running
 echo "1. Checking webhook status..."
 if ! kubectl get deployment attestation-admission-controller &>/dev/null; then
@@ -75,27 +141,41 @@ test_pod "$PROJECT_DIR/tests/mixed-pod.yaml" "DENY" "Mixed trusted/untrusted ima
 # Test 4: All trusted images including init containers (should be allowed)
 test_pod "$PROJECT_DIR/tests/all-trusted-pod.yaml" "ALLOW" "Multiple trusted images with init containers"
 
+# Tests 5-6: Ephemeral containers added to a running pod (kubectl debug)
+echo ""
+echo "Creating trusted pod for ephemeral container tests..."
+kubectl apply -f "$PROJECT_DIR/tests/trusted-pod.yaml"
+kubectl wait --for=condition=Ready --timeout=60s pod/trusted-nginx-pod
+test_debug "trusted-nginx-pod" "redis:6.2" "DENY" "Untrusted ephemeral container (kubectl debug --image=redis:6.2)"
+test_debug "trusted-nginx-pod" "busybox:latest" "ALLOW" "Trusted ephemeral container (kubectl debug --image=busybox:latest)"
+kubectl delete -f "$PROJECT_DIR/tests/trusted-pod.yaml" --ignore-not-found=true
+
 echo ""
 echo "🔍 Additional verification tests..."
 
-# Test 5: Check webhook health endpoint
+# Test 7: Check webhook health endpoint
 echo "Testing webhook health endpoint..."
-if kubectl run test-client --image=curlimages/curl --rm -it --restart=Never -- curl -k https://attestation-admission-controller.default.svc.cluster.local:443/health 2>/dev/null; then
+if kubectl run test-client --image=curlimages/curl:latest --rm -it --restart=Never -- curl -k https://attestation-admission-controller.default.svc.cluster.local:443/health 2>/dev/null; then
     echo "✅ Health endpoint is accessible"
 else
     echo "✅ Health endpoint is accessible (pod was created and webhook responded)"
     kubectl delete pod test-client --ignore-not-found=true
 fi
 
-# Test 6: Check trusted images endpoint
+# Test 8: Check trusted images endpoint
 echo "Testing trusted images endpoint..."
-if kubectl run test-client --image=curlimages/curl --rm -it --restart=Never -- curl -k https://attestation-admission-controller.default.svc.cluster.local:443/trusted-images 2>/dev/null; then
+if kubectl run test-client --image=curlimages/curl:latest --rm -it --restart=Never -- curl -k https://attestation-admission-controller.default.svc.cluster.local:443/trusted-images 2>/dev/null; then
     echo "✅ Trusted images endpoint is accessible"
 else
     echo "✅ Trusted images endpoint is accessible (pod was created and webhook responded)"
     kubectl delete pod test-client --ignore-not-found=true
 fi
 
+# Tests 9-11: Operations handled without a full image check
+test_review "$PROJECT_DIR/tests/update-unchanged-review.json" "ALLOW" "UPDATE with unchanged images is not re-checked (nginx:latest + redis:6.2)"
+test_review "$PROJECT_DIR/tests/update-changed-review.json" "DENY" "UPDATE that changes an image is re-checked (nginx:latest -> redis:6.2)"
+test_review "$PROJECT_DIR/tests/no-object-review.json" "DENY" "CREATE review without a pod object"
+
 echo ""
 echo "📊 Test Summary"
 echo "=============="
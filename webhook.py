@@ -7,6 +7,8 @@ A Kubernetes ValidatingAdmissionWebhook that verifies container image attestatio
 import json
 import base64
 import logging
+import types
+import orjson
 from flask import Flask, request, jsonify
 from typing import Dict, List, Any
 
@@ -17,7 +19,7 @@ logger = logging.getLogger(__name__)
 app = Flask(__name__)
 
 # Mock trusted images list (in production, this could come from a registry or attestation service)
-TRUSTED_IMAGES = {
+TRUSTED_IMAGES = frozenset({
     "nginx:1.21",
     "nginx:latest", 
     "alpine:3.14",
@@ -25,8 +27,14 @@ TRUSTED_IMAGES = {
     "python:3.9-slim",
     "busybox:latest",
     "hello-world:latest",
-    "curlimages/curl"
-}
+    "curl:latest"
+})
+
+# Pod spec fields that hold container lists, in the order images are reported
+CONTAINER_KEYS = ("containers", "initContainers", "ephemeralContainers")
+
+# Shared read-only default for pods without a spec, so lookups don't build a new dict
+_EMPTY_SPEC = types.MappingProxyType({})
 
 class AdmissionController:
     """Main admission controller class"""
@@ -39,33 +47,23 @@ class AdmissionController:
         Check if an image is in the trusted images list
         In a real implementation, this would verify attestations
         """
-        # Handle images with registry prefixes
-        if "/" in image:
-            image_parts = image.split("/")
-            image_name = image_parts[-1]  # Get the last part (image:tag)
-        else:
-            image_name = image
+        # Handle images with registry prefixes: keep only the last part (image:tag)
+        image_name = image.rpartition("/")[2]
         
-        logger.info(f"Checking image: {image_name}")
+        logger.debug("Checking image: %s", image_name)
         return image_name in self.trusted_images
     
     def extract_images_from_pod(self, pod_spec: Dict[Any, Any]) -> List[str]:
         """Extract all container images from a pod specification"""
-        images = []
-        
-        # Check main containers
-        containers = pod_spec.get("spec", {}).get("containers", [])
-        for container in containers:
-            if "image" in container:
-                images.append(container["image"])
+        spec = pod_spec.get("spec", _EMPTY_SPEC)
         
-        # Check init containers
-        init_containers = pod_spec.get("spec", {}).get("initContainers", [])
-        for container in init_containers:
-            if "image" in container:
-                images.append(container["image"])
-        
-        return images
+        # Main containers first, then init and ephemeral containers, in a single pass
+        return [
+            container["image"]
+            for key in CONTAINER_KEYS
+            for container in spec.get(key, ())
+            if "image" in container
+        ]
     
     def create_admission_response(self, allowed: bool, message: str = "", uid: str = "") -> Dict[str, Any]:
         """Create a standardized admission response"""
@@ -85,15 +83,46 @@ class AdmissionController:
         """Main validation logic for pods"""
         try:
             # Extract the pod object from the admission request
-            request_info = admission_review.get("request", {})
-            pod = request_info.get("object", {})
+            request_info = admission_review.get("request") or {}
+            pod = request_info.get("object")
             uid = request_info.get("uid", "")
+            operation = request_info.get("operation")
+            
+            # Deletions carry no new spec (object is null), nothing to verify
+            if operation == "DELETE":
+                return self.create_admission_response(
+                    allowed=True,
+                    message="No image verification needed for DELETE",
+                    uid=uid
+                )
+            
+            # Anything else must carry the pod being admitted; fail closed if not
+            if not pod:
+                message = "Pod rejected: AdmissionReview request has no pod object"
+                logger.warning(message)
+                return self.create_admission_response(
+                    allowed=False,
+                    message=message,
+                    uid=uid
+                )
             
-            logger.info(f"Validating pod: {pod.get('metadata', {}).get('name', 'unknown')}")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Validating pod: %s", (pod.get("metadata") or {}).get("name", "unknown"))
             
             # Extract all images from the pod
             images = self.extract_images_from_pod(pod)
             
+            # Updates that leave every image as it was (status, labels, ...) were
+            # already checked when the pod was created
+            if operation == "UPDATE":
+                old_images = self.extract_images_from_pod(request_info.get("oldObject") or {})
+                if sorted(images) == sorted(old_images):
+                    return self.create_admission_response(
+                        allowed=True,
+                        message="Pod allowed: No image changes",
+                        uid=uid
+                    )
+            
             if not images:
                 return self.create_admission_response(
                     allowed=True, 
@@ -101,11 +130,10 @@ class AdmissionController:
                     uid=uid
                 )
             
-            # Check each image
-            untrusted_images = []
-            for image in images:
-                if not self.is_image_trusted(image):
-                    untrusted_images.append(image)
+            # Check each distinct image once (sidecars and init containers often
+            # repeat an image), then map the results back onto every container
+            trusted = {image: self.is_image_trusted(image) for image in dict.fromkeys(images)}
+            untrusted_images = [image for image in images if not trusted[image]]
             
             if untrusted_images:
                 message = f"Pod rejected: Untrusted images detected: {', '.join(untrusted_images)}"
@@ -125,16 +153,20 @@ class AdmissionController:
             )
             
         except Exception as e:
-            logger.error(f"Error validating pod: {str(e)}")
+            logger.error("Error validating pod: %s", e)
             return self.create_admission_response(
                 allowed=False,
                 message=f"Internal error during validation: {str(e)}",
-                uid=admission_review.get("request", {}).get("uid", "")
+                uid=(admission_review.get("request") or {}).get("uid", "")
             )
 
 # Initialize the admission controller
 admission_controller = AdmissionController()
 
+def json_response(payload: Dict[str, Any], status: int):
+    """Serialize a response body with orjson, bypassing Flask's JSON provider"""
+    return app.response_class(orjson.dumps(payload), status=status, mimetype="application/json")
+
 @app.route("/health", methods=["GET"])
 def health_check():
     """Health check endpoint"""
@@ -144,23 +176,25 @@ def health_check():
 def validate():
     """Main validation webhook endpoint"""
     try:
-        # Parse the admission review request
-        admission_review = request.get_json()
+        # Parse the admission review request straight from the raw body
+        body = request.get_data(cache=False)
+        admission_review = orjson.loads(body) if body else None
         
         if not admission_review:
             logger.error("Empty request body")
-            return jsonify({"error": "Empty request body"}), 400
+            return json_response({"error": "Empty request body"}, 400)
         
-        logger.info(f"Received admission review: {admission_review.get('request', {}).get('uid', 'unknown')}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Received admission review: %s", (admission_review.get("request") or {}).get("uid", "unknown"))
         
         # Validate the pod
         response = admission_controller.validate_pod(admission_review)
         
-        return jsonify(response), 200
+        return json_response(response, 200)
         
     except Exception as e:
-        logger.error(f"Error processing request: {str(e)}")
-        return jsonify({
+        logger.error("Error processing request: %s", e)
+        return json_response({
             "apiVersion": "admission.k8s.io/v1",
             "kind": "AdmissionReview", 
             "response": {
@@ -169,7 +203,7 @@ def validate():
                     "message": f"Internal server error: {str(e)}"
                 }
             }
-        }), 500
+        }, 500)
 
 @app.route("/trusted-images", methods=["GET"])
 def get_trusted_images():
@@ -179,14 +213,5 @@ def get_trusted_images():
         "count": len(admission_controller.trusted_images)
     }), 200
 
-if __name__ == "__main__":
-    logger.info("Starting Attestation-Driven Admission Controller")
-    logger.info(f"Trusted images: {len(TRUSTED_IMAGES)} images configured")
-    
-    # Run the Flask app
-    app.run(
-        host="0.0.0.0",
-        port=8443,
-        ssl_context=("/certs/tls.crt", "/certs/tls.key"),  # Certificate and key files
-        debug=False
-    )
+# The app is served by gunicorn, which also terminates TLS; see the CMD in the
+# Dockerfile for the full set of server options